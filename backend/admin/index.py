@@ -1,21 +1,224 @@
 """
 Business: API админ-панели для управления клиниками (только для администраторов)
-Args: event с httpMethod (GET/POST/PUT/DELETE), body с данными клиники, headers с X-Auth-Token; context с request_id
+Args: event с httpMethod (GET/POST/PUT/DELETE), body с данными клиники или action=batch и operations, headers с X-Auth-Token; context с request_id
 Returns: HTTP response с результатом операции или ошибкой
 """
 import json
 import os
-import jwt
-import psycopg2
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List
+
+CLINIC_FIELDS = ['name', 'image_url', 'address', 'phone', 'email', 'website', 'description']
+REQUIRED_CLINIC_FIELDS = ['name', 'image_url', 'address', 'phone', 'email', 'description']
+MAX_BATCH_OPERATIONS = 1000
+
+# Длины VARCHAR-колонок из V0001; поля TEXT не ограничены
+CLINIC_FIELD_MAX_LENGTHS = {'name': 255, 'phone': 50, 'email': 255, 'website': 255}
+SERVICE_NAME_MAX_LENGTH = 255
+SCHEDULE_FIELD_MAX_LENGTH = 50
+
+@lru_cache(maxsize=1)
+def get_config() -> Dict[str, str]:
+    return {
+        'database_url': os.environ.get('DATABASE_URL', ''),
+        'jwt_secret': os.environ.get('JWT_SECRET', 'fallback-secret-key')
+    }
 
 def verify_admin(token: str, jwt_secret: str) -> tuple[bool, int]:
+    import jwt
     try:
         payload = jwt.decode(token, jwt_secret, algorithms=['HS256'])
         return payload.get('is_admin', False), payload.get('user_id', 0)
     except:
         return False, 0
 
+def has_valid_services_and_schedule(operation: Dict[str, Any]) -> bool:
+    services = operation.get('services', [])
+    schedule = operation.get('schedule', {})
+    if not isinstance(services, list) or not isinstance(schedule, dict):
+        return False
+    if not all(isinstance(service, str) and len(service) <= SERVICE_NAME_MAX_LENGTH for service in services):
+        return False
+    return all(
+        isinstance(hours, str) and len(day_range) <= SCHEDULE_FIELD_MAX_LENGTH and len(hours) <= SCHEDULE_FIELD_MAX_LENGTH
+        for day_range, hours in schedule.items()
+    )
+
+def validate_clinic_fields(operation: Dict[str, Any], creating: bool) -> str:
+    for field in CLINIC_FIELDS:
+        if field not in operation:
+            if creating and field in REQUIRED_CLINIC_FIELDS:
+                return 'Заполните все обязательные поля'
+            continue
+        value = operation[field]
+        if value is None and field not in REQUIRED_CLINIC_FIELDS:
+            continue
+        if not isinstance(value, str):
+            return f'Поле {field} должно быть строкой'
+        if field in REQUIRED_CLINIC_FIELDS and not value.strip():
+            return 'Заполните все обязательные поля'
+        if len(value) > CLINIC_FIELD_MAX_LENGTHS.get(field, len(value)):
+            return f'Поле {field} длиннее {CLINIC_FIELD_MAX_LENGTHS[field]} символов'
+    return ''
+
+def validate_operation(operation: Any, seen_ids: set) -> str:
+    if not isinstance(operation, dict):
+        return 'Операция должна быть объектом'
+    
+    op = operation.get('op')
+    if op == 'create':
+        error = validate_clinic_fields(operation, creating=True)
+        if error:
+            return error
+        if not has_valid_services_and_schedule(operation):
+            return 'Некорректные услуги или расписание'
+        return ''
+    
+    if op in ('update', 'delete'):
+        clinic_id = operation.get('id')
+        if not isinstance(clinic_id, int) or isinstance(clinic_id, bool):
+            return 'Не указан ID клиники'
+        if clinic_id in seen_ids:
+            return 'Клиника встречается в пакете несколько раз'
+        seen_ids.add(clinic_id)
+        if op == 'update':
+            error = validate_clinic_fields(operation, creating=False)
+            if error:
+                return error
+            if not has_valid_services_and_schedule(operation):
+                return 'Некорректные услуги или расписание'
+        return ''
+    
+    return 'Неизвестная операция'
+
+def run_batch(conn: Any, cursor: Any, operations: Any) -> Dict[str, Any]:
+    from psycopg2.extras import execute_values
+    
+    if not isinstance(operations, list) or not operations:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'Передайте непустой список operations'})
+        }
+    
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': f'Не более {MAX_BATCH_OPERATIONS} операций в пакете'})
+        }
+    
+    seen_ids: set = set()
+    errors = []
+    for index, operation in enumerate(operations):
+        error = validate_operation(operation, seen_ids)
+        if error:
+            errors.append({'index': index, 'op': operation.get('op') if isinstance(operation, dict) else None, 'error': error})
+    
+    if errors:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'Пакет отклонён, изменения не применены', 'results': errors})
+        }
+    
+    creates = [(index, op) for index, op in enumerate(operations) if op['op'] == 'create']
+    updates = [(index, op) for index, op in enumerate(operations) if op['op'] == 'update']
+    delete_ids = [op['id'] for op in operations if op['op'] == 'delete']
+    
+    deleted_ids: set = set()
+    if delete_ids:
+        cursor.execute('DELETE FROM clinic_services WHERE clinic_id = ANY(%s)', (delete_ids,))
+        cursor.execute('DELETE FROM clinic_schedules WHERE clinic_id = ANY(%s)', (delete_ids,))
+        cursor.execute('DELETE FROM reviews WHERE clinic_id = ANY(%s)', (delete_ids,))
+        cursor.execute('DELETE FROM clinics WHERE id = ANY(%s) RETURNING id', (delete_ids,))
+        deleted_ids = {row[0] for row in cursor.fetchall()}
+    
+    updated_ids: set = set()
+    if updates:
+        assignments = ', '.join(
+            f"{field} = CASE WHEN v.data ? '{field}' THEN v.data->>'{field}' ELSE c.{field} END"
+            for field in CLINIC_FIELDS
+        )
+        cursor.execute(f'''
+            UPDATE clinics c
+            SET {assignments}, updated_at = CURRENT_TIMESTAMP
+            FROM jsonb_array_elements(%s::jsonb) AS v(data)
+            WHERE c.id = (v.data->>'id')::int
+            RETURNING c.id
+        ''', (json.dumps([op for _, op in updates]),))
+        updated_ids = {row[0] for row in cursor.fetchall()}
+        
+        services_ids = [op['id'] for _, op in updates if 'services' in op and op['id'] in updated_ids]
+        if services_ids:
+            cursor.execute('DELETE FROM clinic_services WHERE clinic_id = ANY(%s)', (services_ids,))
+        schedule_ids = [op['id'] for _, op in updates if 'schedule' in op and op['id'] in updated_ids]
+        if schedule_ids:
+            cursor.execute('DELETE FROM clinic_schedules WHERE clinic_id = ANY(%s)', (schedule_ids,))
+    
+    created_ids: Dict[int, int] = {}
+    if creates:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence('clinics', 'id')) FROM generate_series(1, %s)",
+            (len(creates),)
+        )
+        new_ids = [row[0] for row in cursor.fetchall()]
+        clinic_rows = []
+        for (index, op), clinic_id in zip(creates, new_ids):
+            created_ids[index] = clinic_id
+            clinic_rows.append(tuple([clinic_id] + [str(op.get(field) or '').strip() for field in CLINIC_FIELDS]))
+        execute_values(
+            cursor,
+            f'INSERT INTO clinics (id, {", ".join(CLINIC_FIELDS)}) VALUES %s',
+            clinic_rows,
+            page_size=len(clinic_rows)
+        )
+    
+    service_rows = []
+    schedule_rows = []
+    for index, op in creates + updates:
+        clinic_id = created_ids.get(index, op.get('id'))
+        if op['op'] == 'update' and clinic_id not in updated_ids:
+            continue
+        for service in op.get('services', []):
+            service_rows.append((clinic_id, service))
+        for day_range, hours in op.get('schedule', {}).items():
+            schedule_rows.append((clinic_id, day_range, hours))
+    
+    if service_rows:
+        execute_values(
+            cursor,
+            'INSERT INTO clinic_services (clinic_id, service_name) VALUES %s',
+            service_rows,
+            page_size=len(service_rows)
+        )
+    if schedule_rows:
+        execute_values(
+            cursor,
+            'INSERT INTO clinic_schedules (clinic_id, day_range, hours) VALUES %s',
+            schedule_rows,
+            page_size=len(schedule_rows)
+        )
+    
+    conn.commit()
+    
+    results = []
+    for index, op in enumerate(operations):
+        if op['op'] == 'create':
+            results.append({'index': index, 'op': 'create', 'id': created_ids[index], 'status': 'created'})
+        elif op['op'] == 'update':
+            status = 'updated' if op['id'] in updated_ids else 'not_found'
+            results.append({'index': index, 'op': 'update', 'id': op['id'], 'status': status})
+        else:
+            status = 'deleted' if op['id'] in deleted_ids else 'not_found'
+            results.append({'index': index, 'op': 'delete', 'id': op['id'], 'status': status})
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': json.dumps({'results': results, 'message': 'Пакет операций выполнен'})
+    }
+
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     method: str = event.get('httpMethod', 'GET')
     
@@ -31,8 +234,9 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': ''
         }
     
-    database_url = os.environ.get('DATABASE_URL')
-    jwt_secret = os.environ.get('JWT_SECRET', 'fallback-secret-key')
+    config = get_config()
+    database_url = config['database_url']
+    jwt_secret = config['jwt_secret']
     
     if not database_url:
         return {
@@ -60,6 +264,8 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': json.dumps({'error': 'Доступ запрещён. Требуются права администратора'})
         }
     
+    import psycopg2
+    
     conn = psycopg2.connect(database_url)
     cursor = conn.cursor()
     
@@ -84,6 +290,10 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         elif method == 'POST':
             body_data = json.loads(event.get('body', '{}'))
+            
+            if body_data.get('action') == 'batch':
+                return run_batch(conn, cursor, body_data.get('operations'))
+            
             name = body_data.get('name', '').strip()
             image_url = body_data.get('image_url', '').strip()
             address = body_data.get('address', '').strip()
@@ -143,7 +353,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             update_fields = []
             params = []
             
-            for field in ['name', 'image_url', 'address', 'phone', 'email', 'website', 'description']:
+            for field in CLINIC_FIELDS:
                 if field in body_data:
                     update_fields.append(f'{field} = %s')
                     params.append(body_data[field])
@@ -5,11 +5,16 @@ Returns: HTTP response с JWT токеном или ошибкой
 """
 import json
 import os
-import jwt
-import psycopg2
-from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, Any
 
+@lru_cache(maxsize=1)
+def get_config() -> Dict[str, str]:
+    return {
+        'database_url': os.environ.get('DATABASE_URL', ''),
+        'jwt_secret': os.environ.get('JWT_SECRET', 'fallback-secret-key')
+    }
+
 def hash_password(password: str) -> str:
     import hashlib
     return hashlib.sha256(password.encode()).hexdigest()
@@ -17,6 +22,54 @@ def hash_password(password: str) -> str:
 def verify_password(password: str, password_hash: str) -> bool:
     return hash_password(password) == password_hash
 
+def issue_token(user_id: int, email: str, full_name: str, is_admin: bool, jwt_secret: str) -> str:
+    import jwt
+    from datetime import datetime, timedelta
+    return jwt.encode({
+        'user_id': user_id,
+        'email': email,
+        'full_name': full_name,
+        'is_admin': is_admin,
+        'exp': datetime.utcnow() + timedelta(days=7)
+    }, jwt_secret, algorithm='HS256')
+
+def verify_token(token: str, jwt_secret: str) -> Dict[str, Any]:
+    import jwt
+    
+    if not token:
+        return {
+            'statusCode': 401,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'Токен отсутствует'})
+        }
+    
+    try:
+        payload = jwt.decode(token, jwt_secret, algorithms=['HS256'])
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({
+                'user': {
+                    'id': payload['user_id'],
+                    'email': payload['email'],
+                    'full_name': payload['full_name'],
+                    'is_admin': payload['is_admin']
+                }
+            })
+        }
+    except jwt.ExpiredSignatureError:
+        return {
+            'statusCode': 401,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'Токен истёк'})
+        }
+    except jwt.InvalidTokenError:
+        return {
+            'statusCode': 401,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'Недействительный токен'})
+        }
+
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     method: str = event.get('httpMethod', 'GET')
     
@@ -32,8 +85,30 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': ''
         }
     
-    database_url = os.environ.get('DATABASE_URL')
-    jwt_secret = os.environ.get('JWT_SECRET', 'fallback-secret-key')
+    config = get_config()
+    database_url = config['database_url']
+    jwt_secret = config['jwt_secret']
+    
+    try:
+        body_data = json.loads(event.get('body', '{}'))
+    except Exception as e:
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': str(e)})
+        }
+    
+    if not isinstance(body_data, dict):
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'Некорректное тело запроса'})
+        }
+    
+    action = body_data.get('action', 'login')
+    
+    if action == 'verify':
+        return verify_token(body_data.get('token', ''), jwt_secret)
     
     if not database_url:
         return {
@@ -42,13 +117,12 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': json.dumps({'error': 'Database configuration missing'})
         }
     
+    import psycopg2
+    
     conn = psycopg2.connect(database_url)
     cursor = conn.cursor()
     
     try:
-        body_data = json.loads(event.get('body', '{}'))
-        action = body_data.get('action', 'login')
-        
         if action == 'register':
             email = body_data.get('email', '').strip()
             password = body_data.get('password', '').strip()
@@ -77,13 +151,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             user = cursor.fetchone()
             conn.commit()
             
-            token = jwt.encode({
-                'user_id': user[0],
-                'email': user[1],
-                'full_name': user[2],
-                'is_admin': user[3],
-                'exp': datetime.utcnow() + timedelta(days=7)
-            }, jwt_secret, algorithm='HS256')
+            token = issue_token(user[0], user[1], user[2], user[3], jwt_secret)
             
             return {
                 'statusCode': 200,
@@ -123,13 +191,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     'body': json.dumps({'error': 'Неверный email или пароль'})
                 }
             
-            token = jwt.encode({
-                'user_id': user[0],
-                'email': user[1],
-                'full_name': user[3],
-                'is_admin': user[4],
-                'exp': datetime.utcnow() + timedelta(days=7)
-            }, jwt_secret, algorithm='HS256')
+            token = issue_token(user[0], user[1], user[3], user[4], jwt_secret)
             
             return {
                 'statusCode': 200,
@@ -145,43 +207,6 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 })
             }
         
-        elif action == 'verify':
-            token = body_data.get('token', '')
-            
-            if not token:
-                return {
-                    'statusCode': 401,
-                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                    'body': json.dumps({'error': 'Токен отсутствует'})
-                }
-            
-            try:
-                payload = jwt.decode(token, jwt_secret, algorithms=['HS256'])
-                return {
-                    'statusCode': 200,
-                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                    'body': json.dumps({
-                        'user': {
-                            'id': payload['user_id'],
-                            'email': payload['email'],
-                            'full_name': payload['full_name'],
-                            'is_admin': payload['is_admin']
-                        }
-                    })
-                }
-            except jwt.ExpiredSignatureError:
-                return {
-                    'statusCode': 401,
-                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                    'body': json.dumps({'error': 'Токен истёк'})
-                }
-            except jwt.InvalidTokenError:
-                return {
-                    'statusCode': 401,
-                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                    'body': json.dumps({'error': 'Недействительный токен'})
-                }
-        
         else:
             return {
                 'statusCode': 400,
@@ -5,9 +5,15 @@ Returns: HTTP response со списком клиник или данными к
 """
 import json
 import os
-import psycopg2
+from functools import lru_cache
 from typing import Dict, Any, List
 
+@lru_cache(maxsize=1)
+def get_config() -> Dict[str, str]:
+    return {
+        'database_url': os.environ.get('DATABASE_URL', '')
+    }
+
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     method: str = event.get('httpMethod', 'GET')
     
@@ -23,7 +29,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': ''
         }
     
-    database_url = os.environ.get('DATABASE_URL')
+    database_url = get_config()['database_url']
     
     if not database_url:
         return {
@@ -32,6 +38,8 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': json.dumps({'error': 'Database configuration missing'})
         }
     
+    import psycopg2
+    
     conn = psycopg2.connect(database_url)
     cursor = conn.cursor()
     
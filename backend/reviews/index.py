@@ -1,13 +1,91 @@
 """
 Business: API для добавления отзывов о клиниках (требуется авторизация)
-Args: event с httpMethod (POST), body с clinic_id, rating, review_text, headers с X-Auth-Token; context с request_id
+Args: event с httpMethod (POST), body с clinic_id, rating, review_text, headers с X-Auth-Token и Idempotency-Key; context с request_id
 Returns: HTTP response с созданным отзывом или ошибкой
 """
 import json
 import os
-import jwt
-import psycopg2
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
+
+MAX_REVIEWS_PER_CLINIC = 3
+MAX_IDEMPOTENCY_KEY_LENGTH = 64
+
+# Блокировка пары (пользователь, клиника) до конца транзакции. Берётся отдельным запросом:
+# в READ COMMITTED снимок фиксируется в начале запроса, и COUNT внутри того же запроса
+# не увидел бы отзыв, закоммиченный, пока мы ждали блокировку.
+LOCK_USER_CLINIC_SQL = 'SELECT pg_advisory_xact_lock(%(user_id)s::int, %(clinic_id)s::int)'
+
+# Проверка клиники, лимит отзывов, вставка и имя автора одним запросом.
+# Повтор с тем же ключом находит исходный отзыв в existing и ничего не пишет.
+SUBMIT_REVIEW_SQL = '''
+    WITH clinic AS (
+        SELECT id FROM clinics WHERE id = %(clinic_id)s
+    ),
+    author AS (
+        SELECT id, full_name FROM users WHERE id = %(user_id)s
+    ),
+    existing AS (
+        SELECT id, clinic_id, rating, review_text, created_at
+        FROM reviews
+        WHERE user_id = %(user_id)s AND idempotency_key = %(idempotency_key)s
+    ),
+    user_reviews AS (
+        SELECT COUNT(*) AS total FROM reviews
+        WHERE user_id = %(user_id)s AND clinic_id = %(clinic_id)s
+    ),
+    inserted AS (
+        INSERT INTO reviews (clinic_id, user_id, rating, review_text, idempotency_key)
+        SELECT clinic.id, author.id, %(rating)s, %(review_text)s, %(idempotency_key)s
+        FROM clinic, author, user_reviews
+        WHERE NOT EXISTS (SELECT 1 FROM existing) AND user_reviews.total < %(max_reviews)s
+        ON CONFLICT (user_id, idempotency_key) WHERE idempotency_key IS NOT NULL DO NOTHING
+        RETURNING id, clinic_id, rating, review_text, created_at
+    )
+    SELECT EXISTS (SELECT 1 FROM clinic),
+           (SELECT full_name FROM author),
+           (SELECT total FROM user_reviews),
+           review.id, review.clinic_id, review.rating, review.review_text, review.created_at, review.replayed
+    FROM (SELECT 1) AS one
+    LEFT JOIN (
+        SELECT id, clinic_id, rating, review_text, created_at, FALSE AS replayed FROM inserted
+        UNION ALL
+        SELECT id, clinic_id, rating, review_text, created_at, TRUE AS replayed FROM existing
+    ) AS review ON TRUE
+'''
+
+@lru_cache(maxsize=1)
+def get_config() -> Dict[str, str]:
+    return {
+        'database_url': os.environ.get('DATABASE_URL', ''),
+        'jwt_secret': os.environ.get('JWT_SECRET', 'fallback-secret-key')
+    }
+
+def submit_review(conn: Any, cursor: Any, params: Dict[str, Any]) -> Tuple[Any, ...]:
+    cursor.execute(LOCK_USER_CLINIC_SQL, params)
+    cursor.execute(SUBMIT_REVIEW_SQL, params)
+    row = cursor.fetchone()
+    conn.commit()
+    
+    # Параллельный повтор с тем же ключом (для другой клиники, поэтому блокировка не помогла):
+    # наш INSERT упёрся в уникальный индекс, а снимок запроса ещё не видел чужую строку.
+    clinic_exists, user_name, total, review_id = row[:4]
+    insert_conflicted = (
+        review_id is None and clinic_exists and user_name
+        and params['idempotency_key'] and total < params['max_reviews']
+    )
+    if insert_conflicted:
+        cursor.execute(SUBMIT_REVIEW_SQL, params)
+        row = cursor.fetchone()
+        conn.commit()
+    
+    return row
+
+def get_idempotency_key(headers: Dict[str, Any], body_data: Dict[str, Any]) -> Optional[str]:
+    key = headers.get('idempotency-key') or headers.get('Idempotency-Key') or body_data.get('idempotency_key')
+    if key is None:
+        return None
+    return str(key).strip() or None
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     method: str = event.get('httpMethod', 'POST')
@@ -18,14 +96,15 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'headers': {
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Methods': 'POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type, X-Auth-Token',
+                'Access-Control-Allow-Headers': 'Content-Type, X-Auth-Token, Idempotency-Key',
                 'Access-Control-Max-Age': '86400'
             },
             'body': ''
         }
     
-    database_url = os.environ.get('DATABASE_URL')
-    jwt_secret = os.environ.get('JWT_SECRET', 'fallback-secret-key')
+    config = get_config()
+    database_url = config['database_url']
+    jwt_secret = config['jwt_secret']
     
     if not database_url:
         return {
@@ -44,6 +123,8 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': json.dumps({'error': 'Требуется авторизация'})
         }
     
+    import jwt
+    
     try:
         payload = jwt.decode(auth_token, jwt_secret, algorithms=['HS256'])
         user_id = payload['user_id']
@@ -60,6 +141,8 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': json.dumps({'error': 'Недействительный токен'})
         }
     
+    import psycopg2
+    
     conn = psycopg2.connect(database_url)
     cursor = conn.cursor()
     
@@ -83,37 +166,74 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'body': json.dumps({'error': 'Рейтинг должен быть от 1 до 5'})
             }
         
-        cursor.execute('SELECT id FROM clinics WHERE id = %s', (clinic_id,))
-        if not cursor.fetchone():
+        idempotency_key = get_idempotency_key(headers, body_data)
+        
+        if idempotency_key and len(idempotency_key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'error': 'Слишком длинный ключ идемпотентности'})
+            }
+        
+        clinic_exists, user_name, user_review_total, review_id, review_clinic_id, review_rating, review_body, created_at, replayed = submit_review(conn, cursor, {
+            'clinic_id': clinic_id,
+            'user_id': user_id,
+            'rating': rating,
+            'review_text': review_text,
+            'idempotency_key': idempotency_key,
+            'max_reviews': MAX_REVIEWS_PER_CLINIC
+        })
+        
+        if review_id is None and not clinic_exists:
             return {
                 'statusCode': 404,
                 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
                 'body': json.dumps({'error': 'Клиника не найдена'})
             }
         
-        cursor.execute('''
-            INSERT INTO reviews (clinic_id, user_id, rating, review_text)
-            VALUES (%s, %s, %s, %s)
-            RETURNING id, created_at
-        ''', (clinic_id, user_id, rating, review_text))
+        if review_id is None and not user_name:
+            return {
+                'statusCode': 401,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'error': 'Пользователь не найден'})
+            }
         
-        review = cursor.fetchone()
-        conn.commit()
+        if review_id is None and idempotency_key and user_review_total < MAX_REVIEWS_PER_CLINIC:
+            return {
+                'statusCode': 409,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*', 'Retry-After': '1'},
+                'body': json.dumps({'error': 'Отзыв с этим ключом сейчас сохраняется другим запросом, повторите попытку', 'retryable': True})
+            }
         
-        cursor.execute('SELECT full_name FROM users WHERE id = %s', (user_id,))
-        user_name = cursor.fetchone()[0]
+        if review_id is None:
+            return {
+                'statusCode': 409,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'error': f'Можно оставить не более {MAX_REVIEWS_PER_CLINIC} отзывов об одной клинике'})
+            }
+        
+        if replayed and (str(review_clinic_id) != str(clinic_id) or review_rating != rating or review_body != review_text):
+            return {
+                'statusCode': 422,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'error': 'Ключ идемпотентности уже использован для другого отзыва'})
+            }
         
         return {
             'statusCode': 200,
-            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Idempotent-Replayed': 'true' if replayed else 'false'
+            },
             'body': json.dumps({
-                'id': review[0],
-                'clinic_id': clinic_id,
+                'id': review_id,
+                'clinic_id': review_clinic_id,
                 'user_id': user_id,
                 'author': user_name,
-                'rating': rating,
-                'text': review_text,
-                'date': review[1].isoformat(),
+                'rating': review_rating,
+                'text': review_body,
+                'date': created_at.isoformat(),
                 'message': 'Отзыв успешно добавлен'
             })
         }
@@ -0,0 +1,10 @@
+-- Ключ идемпотентности для повторных отправок отзыва с мобильных клиентов
+ALTER TABLE reviews ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(64);
+
+-- Один отзыв на ключ в рамках пользователя; отзывы без ключа не ограничиваются
+CREATE UNIQUE INDEX IF NOT EXISTS idx_reviews_user_idempotency_key
+    ON reviews(user_id, idempotency_key)
+    WHERE idempotency_key IS NOT NULL;
+
+-- Подсчёт отзывов пользователя о клинике при проверке лимита
+CREATE INDEX IF NOT EXISTS idx_reviews_user_clinic ON reviews(user_id, clinic_id);
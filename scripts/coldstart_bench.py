@@ -0,0 +1,161 @@
+"""
+Business: Замер холодного и тёплого старта облачных функций из backend/
+Args: --warm N (число тёплых вызовов), --top N (строк в профиле импортов), --only auth,clinics,...
+Returns: таблица cold/warm по каждой функции и событию плюс профиль импортов (python -X importtime)
+
+Каждое событие запускается в отдельном процессе интерпретатора, как на холодном инстансе:
+замеряется импорт index.py, первый вызов handler и медиана повторных вызовов в том же процессе.
+Пути, которым нужна БД, требуют DATABASE_URL в окружении — без него handler вернёт 500.
+Для событий с неверным токеном подставляется фиктивный DATABASE_URL: handler проверяет токен
+до подключения к БД, так что строка показывает ленивый импорт jwt, а не ошибку конфигурации.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, Any, List, Tuple
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+
+EVENTS: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {
+    'auth': [
+        ('OPTIONS', {'httpMethod': 'OPTIONS'}),
+        ('verify', {'httpMethod': 'POST', 'body': json.dumps({'action': 'verify', 'token': 'invalid'})}),
+        ('login', {'httpMethod': 'POST', 'body': json.dumps({'action': 'login', 'email': 'wrong@example.com', 'password': 'wrongpass'})}),
+    ],
+    'clinics': [
+        ('OPTIONS', {'httpMethod': 'OPTIONS'}),
+        ('GET list', {'httpMethod': 'GET', 'queryStringParameters': {}}),
+    ],
+    'reviews': [
+        ('OPTIONS', {'httpMethod': 'OPTIONS'}),
+        ('POST bad token', {'httpMethod': 'POST', 'headers': {'X-Auth-Token': 'invalid'}, 'body': '{}'}),
+    ],
+    'admin': [
+        ('OPTIONS', {'httpMethod': 'OPTIONS'}),
+        ('GET bad token', {'httpMethod': 'GET', 'headers': {'X-Auth-Token': 'invalid'}}),
+    ],
+}
+
+# События, которые не доходят до БД, но требуют непустой DATABASE_URL для прохода проверки конфигурации
+PLACEHOLDER_DATABASE_URL_EVENTS = {('reviews', 'POST bad token'), ('admin', 'GET bad token')}
+PLACEHOLDER_DATABASE_URL = 'postgresql://placeholder.invalid/unused'
+
+IMPORT_MARKER = '-- handler imports --'
+
+# Дочерний процесс не импортирует ничего, кроме sys и time, до первого вызова handler,
+# иначе json/typing попадут в кэш модулей раньше и выпадут из профиля. Поэтому событие
+# передаётся как литерал Python, а не JSON.
+CHILD_CODE = '''
+import sys, time
+function_dir, warm, marker = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+event = eval(sys.argv[4], {"__builtins__": {}})
+sys.path.insert(0, function_dir)
+modules_before = len(sys.modules)
+sys.stderr.write(marker + "\\n")
+started = time.perf_counter()
+import index
+imported = time.perf_counter()
+result = {"status": None, "error": None}
+try:
+    result["status"] = index.handler(dict(event), None).get("statusCode")
+except Exception as e:
+    result["error"] = type(e).__name__ + ": " + str(e)
+first_call = time.perf_counter()
+modules_loaded = len(sys.modules) - modules_before
+sys.stderr.write(marker + "\\n")
+import json, statistics
+warm_times = []
+if result["error"] is None:
+    for _ in range(warm):
+        call_started = time.perf_counter()
+        index.handler(dict(event), None)
+        warm_times.append((time.perf_counter() - call_started) * 1000)
+result.update({
+    "import_ms": (imported - started) * 1000,
+    "first_call_ms": (first_call - imported) * 1000,
+    "warm_ms": statistics.median(warm_times) if warm_times else None,
+    "modules_loaded": modules_loaded,
+})
+print(json.dumps(result))
+'''
+
+def parse_importtime(stderr: str, top: int) -> List[Tuple[str, int]]:
+    entries = []
+    handler_imports = stderr.split(IMPORT_MARKER)[1]
+    for line in handler_imports.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Модули верхнего уровня и прямые импорты index.py, без самого index
+        if name[1:].startswith('   ') or name.strip() == 'index':
+            continue
+        entries.append((name.strip(), int(cumulative)))
+    entries.sort(key=lambda item: item[1], reverse=True)
+    return entries[:top]
+
+def measure(function: str, event_index: int, warm: int, top: int) -> Dict[str, Any]:
+    label, event = EVENTS[function][event_index]
+    env = dict(os.environ)
+    if (function, label) in PLACEHOLDER_DATABASE_URL_EVENTS:
+        env.setdefault('DATABASE_URL', PLACEHOLDER_DATABASE_URL)
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD_CODE,
+         os.path.join(BACKEND_DIR, function), str(warm), IMPORT_MARKER,
+         repr(event)],
+        capture_output=True, text=True, env=env
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    if proc.returncode != 0 or not proc.stdout.strip():
+        tail = proc.stderr.strip().splitlines()[-1:] or ['no output']
+        return {'error': tail[0], 'wall_ms': wall_ms, 'imports': []}
+
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result['wall_ms'] = wall_ms
+    result['imports'] = parse_importtime(proc.stderr, top)
+    return result
+
+def format_ms(value: Any) -> str:
+    return '-' if value is None else f'{value:.2f}'
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Cold vs warm start benchmark for backend functions')
+    parser.add_argument('--warm', type=int, default=20)
+    parser.add_argument('--top', type=int, default=5)
+    parser.add_argument('--only', default=','.join(EVENTS))
+    args = parser.parse_args()
+
+    functions = [name.strip() for name in args.only.split(',') if name.strip()]
+    header = f'{"function":<10}{"event":<16}{"status":>7}{"process":>11}{"import":>10}{"cold call":>11}{"warm call":>11}{"modules":>9}'
+    print(header)
+    print('-' * len(header))
+
+    profiles = []
+    for function in functions:
+        for event_index, (label, _) in enumerate(EVENTS[function]):
+            result = measure(function, event_index, args.warm, args.top)
+            if result.get('error') and 'import_ms' not in result:
+                print(f'{function:<10}{label:<16}  {result["error"]}')
+                continue
+            status = result['status'] if result['error'] is None else 'exc'
+            print(
+                f'{function:<10}{label:<16}{status!s:>7}{format_ms(result["wall_ms"]):>11}'
+                f'{format_ms(result["import_ms"]):>10}{format_ms(result["first_call_ms"]):>11}'
+                f'{format_ms(result["warm_ms"]):>11}{result["modules_loaded"]:>9}'
+            )
+            if result['error']:
+                print(f'{"":<26}{result["error"].splitlines()[0]}')
+            profiles.append((function, label, result['imports']))
+
+    print('\nТоп импортов по кумулятивному времени (мкс), включая ленивые импорты пути:')
+    for function, label, imports in profiles:
+        summary = ', '.join(f'{name} {cumulative}' for name, cumulative in imports)
+        print(f'  {function}/{label}: {summary}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+"""
+Business: Локальный HTTP-шлюз для функций backend/ — разработка и нагрузочное тестирование без облака
+Args: --host, --port, --workers (размер пула потоков), --pool-size (соединений с БД), --database-url, --access-log
+Returns: HTTP-сервер, который маршрутизирует /auth, /clinics, /reviews, /admin в handler соответствующей функции
+
+HTTP-запрос превращается в event того же формата, что и на платформе (httpMethod, headers,
+queryStringParameters, body), ответ handler — обратно в HTTP. Соединения принимаются и разбираются
+отдельными потоками, а сами вызовы handler выполняет фиксированный пул из --workers потоков, так что
+простаивающие keep-alive соединения не занимают воркеры. Все четыре функции делят один пул соединений: psycopg2.connect в процессе шлюза
+подменяется на выдачу соединения из пула, а conn.close() в handler возвращает его обратно,
+так что код функций не меняется.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import queue
+import sys
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Dict, Any, Callable, Optional
+from urllib.parse import urlsplit, parse_qsl
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+FUNCTIONS = ['auth', 'clinics', 'reviews', 'admin']
+
+class PooledConnection:
+    def __init__(self, pool: 'ConnectionPool', conn: Any):
+        self._pool = pool
+        self._conn = conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+    def __getattr__(self, name: str) -> Any:
+        if self._conn is None:
+            raise AttributeError(f'connection already returned to pool: {name}')
+        return getattr(self._conn, name)
+
+class ConnectionPool:
+    def __init__(self, connect: Callable[..., Any], dsn: str, size: int):
+        self._connect = connect
+        self._dsn = dsn
+        self._idle: 'queue.LifoQueue[Any]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def acquire(self, *args: Any, **kwargs: Any) -> PooledConnection:
+        self._slots.acquire()
+        try:
+            conn = None
+            while conn is None:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    conn = self._connect(self._dsn)
+                    break
+                if conn.closed:
+                    conn = None
+            return PooledConnection(self, conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn: Any) -> None:
+        try:
+            if not conn.closed:
+                conn.rollback()
+                self._idle.put(conn)
+        except Exception:
+            conn.close()
+        finally:
+            self._slots.release()
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+def install_pool(database_url: str, size: int) -> ConnectionPool:
+    import psycopg2
+
+    pool = ConnectionPool(psycopg2.connect, database_url, size)
+    psycopg2.connect = pool.acquire
+    return pool
+
+def load_handlers() -> Dict[str, Callable[[Dict[str, Any], Any], Dict[str, Any]]]:
+    handlers = {}
+    for name in FUNCTIONS:
+        spec = importlib.util.spec_from_file_location(f'backend_{name}', os.path.join(BACKEND_DIR, name, 'index.py'))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        handlers[name] = module.handler
+    return handlers
+
+class GatewayRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    timeout = 30
+    handlers: Dict[str, Callable[[Dict[str, Any], Any], Dict[str, Any]]] = {}
+    executor: Optional[ThreadPoolExecutor] = None
+    access_log = False
+
+    def dispatch(self) -> None:
+        url = urlsplit(self.path)
+        function, _, rest = url.path.lstrip('/').partition('/')
+        handler = self.handlers.get(function)
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            if length < 0:
+                raise ValueError('negative Content-Length')
+        except ValueError:
+            # Границы тела неизвестны — ответить и закрыть соединение
+            self.close_connection = True
+            self.send_error_json(400, 'Invalid Content-Length header')
+            return
+
+        try:
+            body = self.rfile.read(length).decode('utf-8') if length else ''
+        except UnicodeDecodeError:
+            self.send_error_json(400, 'Request body must be UTF-8')
+            return
+
+        if handler is None:
+            self.send_error_json(404, f'Unknown function, expected one of: {", ".join(FUNCTIONS)}')
+            return
+
+        event = {
+            'httpMethod': self.command,
+            'path': '/' + rest,
+            'headers': dict(self.headers.items()),
+            'queryStringParameters': dict(parse_qsl(url.query, keep_blank_values=True)),
+            'body': body,
+            'isBase64Encoded': False
+        }
+        context = SimpleNamespace(request_id=str(uuid.uuid4()), function_name=function)
+
+        try:
+            response = self.executor.submit(handler, event, context).result()
+        except Exception as e:
+            response = {
+                'statusCode': 502,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'error': f'{type(e).__name__}: {e}'})
+            }
+        self.send_response_dict(response)
+
+    def send_error_json(self, status: int, message: str) -> None:
+        self.send_response_dict({
+            'statusCode': status,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': message})
+        })
+
+    def send_response_dict(self, response: Dict[str, Any]) -> None:
+        payload = (response.get('body') or '').encode('utf-8')
+        self.send_response(response.get('statusCode', 200))
+        for key, value in (response.get('headers') or {}).items():
+            self.send_header(key, str(value))
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_OPTIONS = do_HEAD = dispatch
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.access_log:
+            super().log_message(format, *args)
+
+class GatewayHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 1024
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description='Local gateway for backend functions')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--pool-size', type=int, default=None, help='defaults to --workers')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL', ''))
+    parser.add_argument('--access-log', action='store_true')
+    args = parser.parse_args(argv)
+
+    pool = None
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+        pool = install_pool(args.database_url, args.pool_size or args.workers)
+
+    executor = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix='gateway')
+    GatewayRequestHandler.handlers = load_handlers()
+    GatewayRequestHandler.executor = executor
+    GatewayRequestHandler.access_log = args.access_log
+
+    server = GatewayHTTPServer((args.host, args.port), GatewayRequestHandler)
+    base_url = f'http://{args.host}:{server.server_address[1]}'
+    for name in FUNCTIONS:
+        print(f'{name:<8} {base_url}/{name}')
+    print(f'workers={args.workers} db_pool={(args.pool_size or args.workers) if pool else "disabled"}')
+    sys.stdout.flush()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        executor.shutdown(wait=False, cancel_futures=True)
+        if pool:
+            pool.close_all()
+
+if __name__ == '__main__':
+    main()
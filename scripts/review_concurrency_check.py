@@ -0,0 +1,100 @@
+"""
+Business: Проверка лимита отзывов и идемпотентности функции reviews при параллельных запросах
+Args: --user-id, --clinic-id, --requests (число параллельных отправок); DATABASE_URL и JWT_SECRET в окружении
+Returns: код выхода 0, если записано не больше MAX_REVIEWS_PER_CLINIC отзывов и повторы ключа дали одну строку
+
+Запускать только на локальной или тестовой БД: скрипт пишет отзывы с ключами check-* и удаляет их в конце.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import uuid
+from typing import Any, Dict, List
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+
+def submit_concurrently(handler: Any, token: str, bodies: List[Dict[str, Any]], keys: List[str]) -> List[int]:
+    statuses: List[int] = []
+    barrier = threading.Barrier(len(bodies))
+
+    def submit(body: Dict[str, Any], key: str) -> None:
+        barrier.wait()
+        response = handler({
+            'httpMethod': 'POST',
+            'headers': {'X-Auth-Token': token, 'Idempotency-Key': key},
+            'body': json.dumps(body)
+        }, None)
+        statuses.append(response['statusCode'])
+
+    threads = [threading.Thread(target=submit, args=pair) for pair in zip(bodies, keys)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(statuses)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Concurrency check for review submission')
+    parser.add_argument('--user-id', type=int, default=2)
+    parser.add_argument('--clinic-id', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=10)
+    args = parser.parse_args()
+
+    import jwt
+    import psycopg2
+
+    sys.path.insert(0, os.path.join(BACKEND_DIR, 'reviews'))
+    import index
+
+    database_url = os.environ['DATABASE_URL']
+    token = jwt.encode({'user_id': args.user_id}, index.get_config()['jwt_secret'], algorithm='HS256')
+    prefix = f'check-{uuid.uuid4().hex[:8]}'
+    conn = psycopg2.connect(database_url)
+    cursor = conn.cursor()
+    failed = False
+
+    try:
+        cursor.execute(
+            'SELECT COUNT(*) FROM reviews WHERE user_id = %s AND clinic_id = %s',
+            (args.user_id, args.clinic_id)
+        )
+        before = cursor.fetchone()[0]
+        body = {'clinic_id': args.clinic_id, 'rating': 5, 'review_text': 'concurrency check'}
+
+        statuses = submit_concurrently(
+            index.handler, token, [body] * args.requests,
+            [f'{prefix}-{i}' for i in range(args.requests)]
+        )
+        cursor.execute(
+            'SELECT COUNT(*) FROM reviews WHERE user_id = %s AND clinic_id = %s',
+            (args.user_id, args.clinic_id)
+        )
+        after = cursor.fetchone()[0]
+        allowed = max(index.MAX_REVIEWS_PER_CLINIC - before, 0)
+        written = after - before
+        print(f'limit: {statuses} written={written} allowed={allowed}')
+        failed |= written > allowed
+
+        cursor.execute('DELETE FROM reviews WHERE idempotency_key LIKE %s', (f'{prefix}-%',))
+        conn.commit()
+
+        statuses = submit_concurrently(
+            index.handler, token, [body] * args.requests, [f'{prefix}-same'] * args.requests
+        )
+        cursor.execute('SELECT COUNT(*) FROM reviews WHERE idempotency_key = %s', (f'{prefix}-same',))
+        same_key_rows = cursor.fetchone()[0]
+        print(f'same key: {statuses} rows={same_key_rows}')
+        failed |= same_key_rows > 1
+    finally:
+        cursor.execute('DELETE FROM reviews WHERE idempotency_key LIKE %s', (f'{prefix}-%',))
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+    print('FAIL' if failed else 'OK')
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
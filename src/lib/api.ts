@@ -1,8 +1,32 @@
-const API_URLS = {
-  auth: 'https://functions.poehali.dev/f0cdbeae-8ff1-4f35-8c57-2ba527544c72',
-  clinics: 'https://functions.poehali.dev/18b3bd5a-c312-417d-9155-32cbe4284aba',
-  reviews: 'https://functions.poehali.dev/89d4863e-1b44-4036-aeeb-3d960d40bb04',
-  admin: 'https://functions.poehali.dev/a74c7513-a390-40bf-b646-10d49e541e37'
+const LOCAL_API_BASE: string | undefined = import.meta.env.VITE_API_BASE_URL;
+
+const API_URLS = LOCAL_API_BASE
+  ? {
+      auth: `${LOCAL_API_BASE}/auth`,
+      clinics: `${LOCAL_API_BASE}/clinics`,
+      reviews: `${LOCAL_API_BASE}/reviews`,
+      admin: `${LOCAL_API_BASE}/admin`
+    }
+  : {
+      auth: 'https://functions.poehali.dev/f0cdbeae-8ff1-4f35-8c57-2ba527544c72',
+      clinics: 'https://functions.poehali.dev/18b3bd5a-c312-417d-9155-32cbe4284aba',
+      reviews: 'https://functions.poehali.dev/89d4863e-1b44-4036-aeeb-3d960d40bb04',
+      admin: 'https://functions.poehali.dev/a74c7513-a390-40bf-b646-10d49e541e37'
+    };
+
+// crypto.randomUUID есть только в secure context (HTTPS или localhost);
+// при открытии dev-сервера по http с другого устройства собираем UUID v4 из getRandomValues
+export const createIdempotencyKey = (): string => {
+  if (typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID();
+  }
+  
+  const bytes = crypto.getRandomValues(new Uint8Array(16));
+  bytes[6] = (bytes[6] & 0x0f) | 0x40;
+  bytes[8] = (bytes[8] & 0x3f) | 0x80;
+  const hex = Array.from(bytes, byte => byte.toString(16).padStart(2, '0')).join('');
+  
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
 };
 
 export type User = {
@@ -95,12 +119,13 @@ export const clinicsAPI = {
 };
 
 export const reviewsAPI = {
-  async add(token: string, clinicId: number, rating: number, reviewText: string) {
+  async add(token: string, clinicId: number, rating: number, reviewText: string, idempotencyKey?: string) {
     const response = await fetch(API_URLS.reviews, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
-        'X-Auth-Token': token
+        'X-Auth-Token': token,
+        'Idempotency-Key': idempotencyKey ?? createIdempotencyKey()
       },
       body: JSON.stringify({ clinic_id: clinicId, rating, review_text: reviewText })
     });
@@ -184,6 +209,25 @@ export const adminAPI = {
       throw new Error(data.error || 'Ошибка удаления клиники');
     }
     
+    return data;
+  },
+
+  async batch(token: string, operations: any[]) {
+    const response = await fetch(API_URLS.admin, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'X-Auth-Token': token
+      },
+      body: JSON.stringify({ action: 'batch', operations })
+    });
+    
+    const data = await response.json();
+    
+    if (!response.ok) {
+      throw new Error(data.error || 'Ошибка пакетной операции');
+    }
+    
     return data;
   }
 };
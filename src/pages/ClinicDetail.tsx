@@ -1,4 +1,4 @@
-import { useState } from 'react';
+import { useRef, useState } from 'react';
 import { Button } from '@/components/ui/button';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
@@ -8,7 +8,7 @@ import { useToast } from '@/hooks/use-toast';
 import Icon from '@/components/ui/icon';
 import type { Clinic } from '@/App';
 import type { User } from '@/lib/api';
-import { reviewsAPI } from '@/lib/api';
+import { reviewsAPI, createIdempotencyKey } from '@/lib/api';
 import { authStorage } from '@/lib/auth';
 
 type ClinicDetailProps = {
@@ -50,6 +50,7 @@ const ClinicDetail = ({ clinic, onBack, user, onReviewAdded }: ClinicDetailProps
   const [newReviewRating, setNewReviewRating] = useState(5);
   const [newReviewText, setNewReviewText] = useState('');
   const [submitting, setSubmitting] = useState(false);
+  const reviewKeyRef = useRef<{ key: string; payload: string } | null>(null);
   const { toast } = useToast();
 
   const handleSubmitReview = async () => {
@@ -76,7 +77,12 @@ const ClinicDetail = ({ clinic, onBack, user, onReviewAdded }: ClinicDetailProps
       const token = authStorage.getToken();
       if (!token) throw new Error('Токен не найден');
 
-      await reviewsAPI.add(token, clinic.id, newReviewRating, newReviewText);
+      const payload = JSON.stringify([clinic.id, newReviewRating, newReviewText.trim()]);
+      if (reviewKeyRef.current?.payload !== payload) {
+        reviewKeyRef.current = { key: createIdempotencyKey(), payload };
+      }
+      await reviewsAPI.add(token, clinic.id, newReviewRating, newReviewText, reviewKeyRef.current.key);
+      reviewKeyRef.current = null;
 
       toast({
         title: 'Успех',